@@ -6,7 +6,7 @@ import shutil
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import multiprocessing
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response
 from flask_cors import CORS
 import numpy as np
 import cv2
@@ -16,6 +16,7 @@ from insightface.app import FaceAnalysis
 from urllib.parse import unquote
 
 import config
+from results_store import ResultsStore
 
 app = Flask(__name__)
 CORS(app)
@@ -24,7 +25,9 @@ CORS(app)
 face_app = None
 face_app_lock = threading.Lock()  # Lock for face_app initialization
 person_embeddings = {}
+results_store = ResultsStore(config.RESULTS_DB, flush_every=config.RESULTS_FLUSH_EVERY)
 organize_state = {
+    'run_id': None,
     'active': False,
     'initializing': False,  # New state for initialization phase
     'progress': {
@@ -203,7 +206,7 @@ def process_photo(photo_path, threshold, check_all_orientations=False):
                 faces = face_app.get(rotated_img)
                 
                 # Match against person embeddings (vectorized)
-                for face in faces:
+                for face_idx, face in enumerate(faces):
                     face_embedding = face.embedding
                     # Normalize face embedding
                     face_norm = face_embedding / np.linalg.norm(face_embedding)
@@ -217,7 +220,10 @@ def process_photo(photo_path, threshold, check_all_orientations=False):
                     for idx in match_indices:
                         all_matches.append({
                             'person': person_names[idx],
-                            'similarity': float(similarities[idx])
+                            'similarity': float(similarities[idx]),
+                            'face': face_idx,
+                            'rotation': rotation,
+                            'bbox': [float(v) for v in face.bbox]
                         })
             
             # Remove duplicate matches (keep highest similarity for each person)
@@ -237,7 +243,7 @@ def process_photo(photo_path, threshold, check_all_orientations=False):
             
             # Match against person embeddings (vectorized)
             matches = []
-            for face in faces:
+            for face_idx, face in enumerate(faces):
                 face_embedding = face.embedding
                 # Normalize face embedding
                 face_norm = face_embedding / np.linalg.norm(face_embedding)
@@ -251,7 +257,10 @@ def process_photo(photo_path, threshold, check_all_orientations=False):
                 for idx in match_indices:
                     matches.append({
                         'person': person_names[idx],
-                        'similarity': float(similarities[idx])
+                        'similarity': float(similarities[idx]),
+                        'face': face_idx,
+                        'rotation': 0,
+                        'bbox': [float(v) for v in face.bbox]
                     })
             
             return matches
@@ -284,9 +293,14 @@ def copy_to_person_folder(photo_path, person_name, output_dir, similarity):
     
     return str(dest_path)
 
-def organize_photos_thread(input_folder, output_folder, threshold, check_all_orientations=False):
+def organize_photos_thread(state, input_folder, output_folder, threshold, check_all_orientations=False):
     """Background thread for organizing photos with parallel processing"""
-    global organize_state, face_app
+    global face_app
+    
+    # state is this run's organize_state dict; organize_start replaces the
+    # global for each run, and a cancelled run may still be finishing when
+    # the next one starts
+    run_id = state['run_id']
     
     try:
         # Ensure face_app is initialized before processing (with lock for safety)
@@ -294,26 +308,28 @@ def organize_photos_thread(input_folder, output_folder, threshold, check_all_ori
             if face_app is None:
                 error_msg = 'CRITICAL: Face detection not initialized. Cannot process images.'
                 print(f"ERROR: {error_msg}")
-                organize_state['active'] = False
-                organize_state['initializing'] = False
-                organize_state['error'] = error_msg
+                state['active'] = False
+                state['initializing'] = False
+                state['error'] = error_msg
+                results_store.finish_run(run_id, 'failed', 0, 0)
                 return
             print("✓ Thread verified face_app is initialized")
         
         # Get all image files
         print(f"Scanning folder: {input_folder}")
         image_files = get_image_files(input_folder)
-        organize_state['progress']['total'] = len(image_files)
-        organize_state['progress']['scanned'] = 0
-        organize_state['progress']['organized'] = 0
+        state['progress']['total'] = len(image_files)
+        state['progress']['scanned'] = 0
+        state['progress']['organized'] = 0
         
         print(f"Found {len(image_files)} images to process")
         
         if len(image_files) == 0:
             print(f"WARNING: No image files found in {input_folder}")
             print("Supported formats: .jpg, .jpeg, .png, .bmp, .tiff, .gif")
-            organize_state['active'] = False
-            organize_state['error'] = f'No images found in folder. Supported formats: JPG, PNG, BMP, TIFF, GIF'
+            state['active'] = False
+            state['error'] = f'No images found in folder. Supported formats: JPG, PNG, BMP, TIFF, GIF'
+            results_store.finish_run(run_id, 'failed', 0, 0)
             return
         
         # Use ThreadPoolExecutor for parallel processing
@@ -336,7 +352,7 @@ def organize_photos_thread(input_folder, output_folder, threshold, check_all_ori
             # Process completed tasks as they finish
             for future in as_completed(future_to_photo):
                 # Check for cancellation
-                if organize_state['cancel_requested']:
+                if state['cancel_requested']:
                     print("Organization cancelled by user")
                     executor.shutdown(wait=False, cancel_futures=True)
                     break
@@ -345,70 +361,73 @@ def organize_photos_thread(input_folder, output_folder, threshold, check_all_ori
                 
                 # Update scanned count (thread-safe)
                 with state_lock:
-                    organize_state['progress']['scanned'] += 1
-                    organize_state['progress']['currentFile'] = Path(photo_path).name
+                    state['progress']['scanned'] += 1
+                    state['progress']['currentFile'] = Path(photo_path).name
                 
                 try:
                     # Get processing results
                     matches = future.result()
                     
-                    # Copy to person folders and update state
+                    # Copy to person folders and record matches
                     for match in matches:
                         person_name = match['person']
                         similarity = match['similarity']
                         
                         with state_lock:
-                            organize_state['progress']['currentPerson'] = person_name
+                            state['progress']['currentPerson'] = person_name
                         
                         # Copy file (I/O operation, can be outside lock)
                         new_path = copy_to_person_folder(photo_path, person_name, output_folder, similarity)
                         
-                        # Update results (thread-safe)
+                        # Persist match to the results store
+                        results_store.add_match(
+                            run_id, photo_path, new_path, person_name,
+                            match['face'], match['rotation'], similarity,
+                            match['bbox'], time.time()
+                        )
+                        
+                        # Only per-person counts are kept in memory (thread-safe)
                         with state_lock:
-                            if person_name not in organize_state['persons']:
-                                organize_state['persons'][person_name] = {
-                                    'name': person_name,
-                                    'photoCount': 0,
-                                    'photos': []
-                                }
-                            
-                            organize_state['persons'][person_name]['photoCount'] += 1
-                            organize_state['persons'][person_name]['photos'].append({
-                                'originalPath': photo_path,
-                                'newPath': new_path,
-                                'filename': Path(photo_path).name,
-                                'similarity': similarity,
-                                'timestamp': time.time()
-                            })
-                            
-                            organize_state['progress']['organized'] += 1
+                            state['persons'][person_name] = state['persons'].get(person_name, 0) + 1
+                            state['progress']['organized'] += 1
                 
                 except Exception as e:
                     print(f"Error processing {photo_path}: {e}")
         
         # Mark as complete
-        organize_state['active'] = False
-        organize_state['progress']['currentFile'] = ''
-        organize_state['progress']['currentPerson'] = ''
+        results_store.finish_run(
+            run_id,
+            'cancelled' if state['cancel_requested'] else 'complete',
+            state['progress']['scanned'],
+            state['progress']['organized']
+        )
+        state['active'] = False
+        state['progress']['currentFile'] = ''
+        state['progress']['currentPerson'] = ''
         
         print(f"\n{'='*60}")
         print(f"✓ ORGANIZATION COMPLETE")
         print(f"{'='*60}")
-        print(f"  Total scanned: {organize_state['progress']['scanned']}")
-        print(f"  Total organized: {organize_state['progress']['organized']}")
-        print(f"  Person folders: {len(organize_state['persons'])}")
-        if organize_state['persons']:
-            for person_name, person_data in organize_state['persons'].items():
-                print(f"    - {person_name}: {person_data['photoCount']} photos")
+        print(f"  Total scanned: {state['progress']['scanned']}")
+        print(f"  Total organized: {state['progress']['organized']}")
+        print(f"  Person folders: {len(state['persons'])}")
+        if state['persons']:
+            for person_name, photo_count in state['persons'].items():
+                print(f"    - {person_name}: {photo_count} photos")
         print(f"{'='*60}\n")
         
     except Exception as e:
         print(f"❌ Error in organize thread: {e}")
-        organize_state['active'] = False
-        organize_state['error'] = str(e)
+        state['active'] = False
+        state['error'] = str(e)
+        results_store.finish_run(
+            run_id, 'failed',
+            state['progress'].get('scanned', 0),
+            state['progress'].get('organized', 0)
+        )
         # Still log what we had before error
-        print(f"  Persons before error: {len(organize_state.get('persons', {}))}")
-        print(f"  Scanned before error: {organize_state['progress'].get('scanned', 0)}")
+        print(f"  Persons before error: {len(state.get('persons', {}))}")
+        print(f"  Scanned before error: {state['progress'].get('scanned', 0)}")
 
 @app.route('/api/health', methods=['GET'])
 def health():
@@ -519,6 +538,7 @@ def organize_start():
     
     # NOW reset state and mark as active
     organize_state = {
+        'run_id': results_store.start_run(input_folder, output_folder, threshold),
         'active': True,
         'initializing': False,
         'progress': {
@@ -538,7 +558,7 @@ def organize_start():
     # Start background thread - ONLY after initialization is 100% complete
     thread = threading.Thread(
         target=organize_photos_thread,
-        args=(input_folder, output_folder, threshold, check_all_orientations),
+        args=(organize_state, input_folder, output_folder, threshold, check_all_orientations),
         daemon=True
     )
     thread.start()
@@ -547,13 +567,18 @@ def organize_start():
     
     return jsonify({
         'success': True,
-        'message': 'Organization started'
+        'message': 'Organization started',
+        'runId': organize_state['run_id']
     })
 
 @app.route('/api/organize/progress', methods=['GET'])
 def organize_progress():
     """Get current organization progress"""
-    persons_list = list(organize_state['persons'].values())
+    # Counts only; photos are paged from /api/organize/results/photos
+    persons_list = [
+        {'name': name, 'photoCount': count}
+        for name, count in sorted(list(organize_state['persons'].items()))
+    ]
     
     # Debug logging when returning data
     if not organize_state['active'] and not organize_state.get('initializing', False):
@@ -563,26 +588,118 @@ def organize_progress():
     return jsonify({
         'active': organize_state['active'],
         'initializing': organize_state.get('initializing', False),
+        'runId': organize_state['run_id'],
         'progress': organize_state['progress'],
         'persons': persons_list,
         'error': organize_state.get('error', None)
     })
 
+def requested_run_id():
+    """Run id from the query string, defaulting to the current or latest run"""
+    run_id = request.args.get('runId', type=int)
+    if run_id is None:
+        run_id = organize_state['run_id'] or results_store.latest_run_id()
+    return run_id
+
 @app.route('/api/organize/results', methods=['GET'])
 def organize_results():
-    """Get final organization results"""
-    persons_list = list(organize_state['persons'].values())
-    print(f"\n📊 Results requested:")
+    """Get per-person match counts for a run (defaults to the current or latest run)"""
+    run_id = requested_run_id()
+    
+    if run_id is None:
+        return jsonify({
+            'runId': None,
+            'persons': [],
+            'totalScanned': 0,
+            'totalOrganized': 0
+        })
+    
+    run = results_store.get_run(run_id)
+    if run is None:
+        return jsonify({'error': f'Run not found: {run_id}'}), 404
+    
+    # Flush buffered rows so the current run is complete on disk
+    results_store.flush()
+    persons_list = results_store.get_person_counts(run_id)
+    
+    # A live run's totals are only written to the store when it finishes
+    if run_id == organize_state['run_id']:
+        total_scanned = organize_state['progress']['scanned']
+        total_organized = organize_state['progress']['organized']
+    else:
+        total_scanned = run['totalScanned']
+        total_organized = run['totalOrganized']
+    
+    print(f"\n📊 Results requested (run {run_id}):")
     print(f"  Persons: {len(persons_list)}")
-    print(f"  Scanned: {organize_state['progress']['scanned']}")
-    print(f"  Organized: {organize_state['progress']['organized']}")
+    print(f"  Scanned: {total_scanned}")
+    print(f"  Organized: {total_organized}")
     
     return jsonify({
+        'runId': run_id,
         'persons': persons_list,
-        'totalScanned': organize_state['progress']['scanned'],
-        'totalOrganized': organize_state['progress']['organized']
+        'totalScanned': total_scanned,
+        'totalOrganized': total_organized
     })
 
+@app.route('/api/organize/results/photos', methods=['GET'])
+def organize_results_photos():
+    """Get one page of a person's photos for a run"""
+    run_id = requested_run_id()
+    person = request.args.get('person')
+    limit = min(request.args.get('limit', config.RESULTS_PAGE_SIZE, type=int), config.RESULTS_MAX_PAGE_SIZE)
+    after = request.args.get('after', 0, type=int)
+    
+    if not person:
+        return jsonify({'error': 'No person provided'}), 400
+    
+    if limit < 1:
+        return jsonify({'error': f'Invalid limit: {limit}'}), 400
+    
+    if run_id is None or results_store.get_run(run_id) is None:
+        return jsonify({'error': f'Run not found: {run_id}'}), 404
+    
+    photos, next_cursor = results_store.get_photos(run_id, person, limit=limit, after=after)
+    
+    return jsonify({
+        'runId': run_id,
+        'person': person,
+        'photos': photos,
+        'nextCursor': next_cursor
+    })
+
+@app.route('/api/organize/results/export', methods=['GET'])
+def organize_results_export():
+    """Export a run's matches as CSV or JSONL (defaults to the current or latest run)"""
+    export_format = request.args.get('format', 'csv').lower()
+    if export_format not in ('csv', 'jsonl'):
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+    
+    run_id = requested_run_id()
+    
+    if run_id is None or results_store.get_run(run_id) is None:
+        return jsonify({'error': f'Run not found: {run_id}'}), 404
+    
+    results_store.flush()
+    
+    if export_format == 'csv':
+        body = results_store.export_csv(run_id)
+        mimetype = 'text/csv'
+    else:
+        body = results_store.export_jsonl(run_id)
+        mimetype = 'application/x-ndjson'
+    
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename=run-{run_id}.{export_format}'}
+    )
+
+@app.route('/api/runs', methods=['GET'])
+def list_runs():
+    """List all persisted organization runs, newest first"""
+    return jsonify({'runs': results_store.list_runs()})
+
 @app.route('/api/organize/cancel', methods=['POST'])
 def organize_cancel():
     """Cancel ongoing organization"""
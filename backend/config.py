@@ -10,6 +10,12 @@ PERSON_EMB_DIR = None  # Will be set dynamically
 CACHE_DIR = os.path.join(BASE_DIR, "metadata", "cache")
 ENABLE_CACHE = True
 
+# Run results store (SQLite, paths and person names interned)
+RESULTS_DB = os.path.join(BASE_DIR, "metadata", "results.sqlite3")
+RESULTS_FLUSH_EVERY = 500  # Buffered match rows before writing to disk
+RESULTS_PAGE_SIZE = 200  # Photos per page from /api/organize/results/photos
+RESULTS_MAX_PAGE_SIZE = 1000
+
 # Face detection settings
 FACE_DET_SIZE = (640, 640)
 USE_GPU = True
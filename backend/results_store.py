@@ -0,0 +1,335 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    input_folder TEXT,
+    output_folder TEXT,
+    threshold REAL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    scanned INTEGER NOT NULL DEFAULT 0,
+    organized INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS paths (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS persons (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS matches (
+    run_id INTEGER NOT NULL,
+    photo_id INTEGER NOT NULL,
+    new_path_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    face INTEGER NOT NULL,
+    rotation INTEGER NOT NULL,
+    similarity REAL NOT NULL,
+    x1 REAL, y1 REAL, x2 REAL, y2 REAL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matches_run_person ON matches (run_id, person_id);
+"""
+
+EXPORT_COLUMNS = [
+    'runId', 'person', 'originalPath', 'newPath', 'filename', 'face',
+    'rotation', 'similarity', 'x1', 'y1', 'x2', 'y2', 'timestamp'
+]
+
+RUN_COLUMNS = (
+    "id, input_folder, output_folder, threshold, status, "
+    "started_at, finished_at, scanned, organized"
+)
+
+MATCH_COLUMNS = """
+SELECT m.rowid, pe.name, op.path, np.path, m.face, m.rotation, m.similarity,
+       m.x1, m.y1, m.x2, m.y2, m.timestamp
+FROM matches m
+JOIN persons pe ON pe.id = m.person_id
+JOIN paths op ON op.id = m.photo_id
+JOIN paths np ON np.id = m.new_path_id
+"""
+
+# Stay under SQLite's default bound-parameter limit for IN (...) lookups
+INTERN_CHUNK_SIZE = 500
+
+
+def _run_from_row(row):
+    return {
+        'id': row[0],
+        'inputFolder': row[1],
+        'outputFolder': row[2],
+        'threshold': row[3],
+        'status': row[4],
+        'startedAt': row[5],
+        'finishedAt': row[6],
+        'totalScanned': row[7],
+        'totalOrganized': row[8]
+    }
+
+
+def _match_from_row(run_id, row):
+    (_, person, original_path, new_path, face, rotation, similarity,
+     x1, y1, x2, y2, timestamp) = row
+    return {
+        'runId': run_id,
+        'person': person,
+        'originalPath': original_path,
+        'newPath': new_path,
+        'filename': Path(original_path).name,
+        'face': face,
+        'rotation': rotation,
+        'similarity': similarity,
+        'x1': x1,
+        'y1': y1,
+        'x2': x2,
+        'y2': y2,
+        'timestamp': timestamp
+    }
+
+
+class ResultsStore:
+    """
+    SQLite-backed store for organization runs
+    Paths and person names are interned so each match row is a handful of
+    integers and floats instead of repeated strings
+    """
+
+    def __init__(self, db_path, flush_every=500, flush_interval=1.0):
+        self.db_path = db_path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()        # Guards the pending buffer
+        self._write_lock = threading.Lock()  # Guards the writer connection
+        self._pending = []
+        self._last_flush = time.time()
+        self._person_ids = {}
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = self._connect()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        # Runs still marked running were cut short by a restart
+        self._conn.execute(
+            "UPDATE runs SET status = 'interrupted' WHERE status = 'running'"
+        )
+        self._conn.commit()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, check_same_thread=False)
+
+    def _intern_persons(self, names):
+        """Return {name: id} for person names, using the in-memory cache"""
+        for name in set(names) - self._person_ids.keys():
+            self._conn.execute("INSERT OR IGNORE INTO persons (name) VALUES (?)", (name,))
+            self._person_ids[name] = self._conn.execute(
+                "SELECT id FROM persons WHERE name = ?", (name,)
+            ).fetchone()[0]
+        return self._person_ids
+
+    def _intern_paths(self, paths):
+        """Return {path: id} for a batch of paths, inserting new ones in bulk"""
+        unique = list(set(paths))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO paths (path) VALUES (?)", ((path,) for path in unique)
+        )
+        path_ids = {}
+        for i in range(0, len(unique), INTERN_CHUNK_SIZE):
+            chunk = unique[i:i + INTERN_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            for path_id, path in self._conn.execute(
+                f"SELECT id, path FROM paths WHERE path IN ({placeholders})", chunk
+            ):
+                path_ids[path] = path_id
+        return path_ids
+
+    def start_run(self, input_folder, output_folder, threshold):
+        """Create a new run and return its id"""
+        with self._write_lock:
+            cursor = self._conn.execute(
+                "INSERT INTO runs (input_folder, output_folder, threshold, status, started_at) "
+                "VALUES (?, ?, ?, 'running', ?)",
+                (input_folder, output_folder, threshold, time.time())
+            )
+            self._conn.commit()
+            return cursor.lastrowid
+
+    def add_match(self, run_id, original_path, new_path, person, face, rotation,
+                  similarity, bbox, timestamp):
+        """Buffer a match row, flushing by size or age"""
+        x1, y1, x2, y2 = bbox if bbox is not None else (None, None, None, None)
+        batch = None
+        with self._lock:
+            self._pending.append((
+                run_id, original_path, new_path, person, face, rotation,
+                similarity, x1, y1, x2, y2, timestamp
+            ))
+            if (len(self._pending) >= self.flush_every
+                    or time.time() - self._last_flush >= self.flush_interval):
+                batch = self._take_pending_locked()
+        if batch:
+            self._write_batch(batch)
+
+    def flush(self):
+        """Write buffered match rows to disk"""
+        with self._lock:
+            batch = self._take_pending_locked()
+        if batch:
+            self._write_batch(batch)
+
+    def _take_pending_locked(self):
+        batch = self._pending
+        self._pending = []
+        self._last_flush = time.time()
+        return batch
+
+    def _write_batch(self, batch):
+        with self._write_lock:
+            path_ids = self._intern_paths(
+                [row[1] for row in batch] + [row[2] for row in batch]
+            )
+            person_ids = self._intern_persons([row[3] for row in batch])
+            self._conn.executemany(
+                "INSERT INTO matches (run_id, photo_id, new_path_id, person_id, face, "
+                "rotation, similarity, x1, y1, x2, y2, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, path_ids[original_path], path_ids[new_path], person_ids[person],
+                     face, rotation, similarity, x1, y1, x2, y2, timestamp)
+                    for (run_id, original_path, new_path, person, face, rotation,
+                         similarity, x1, y1, x2, y2, timestamp) in batch
+                ]
+            )
+            self._conn.commit()
+
+    def finish_run(self, run_id, status, scanned, organized):
+        """Flush outstanding rows and record the final run status"""
+        self.flush()
+        with self._write_lock:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, finished_at = ?, scanned = ?, organized = ? "
+                "WHERE id = ?",
+                (status, time.time(), scanned, organized, run_id)
+            )
+            self._conn.commit()
+
+    def list_runs(self):
+        """Return all runs, newest first"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {RUN_COLUMNS} FROM runs ORDER BY id DESC"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [_run_from_row(row) for row in rows]
+
+    def get_run(self, run_id):
+        """Return a single run, or None if it does not exist"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT {RUN_COLUMNS} FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return _run_from_row(row) if row is not None else None
+
+    def latest_run_id(self):
+        """Return the id of the most recent run, or None"""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        finally:
+            conn.close()
+        return row[0]
+
+    def get_person_counts(self, run_id):
+        """Return [{'name', 'photoCount'}] for a run without loading any photos"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT pe.name, COUNT(*) FROM matches m "
+                "JOIN persons pe ON pe.id = m.person_id "
+                "WHERE m.run_id = ? GROUP BY m.person_id ORDER BY pe.name",
+                (run_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [{'name': name, 'photoCount': count} for name, count in rows]
+
+    def get_photos(self, run_id, person, limit=200, after=0):
+        """
+        Return one page of a person's photos in a run
+        Pages are keyed on match rowid; returns (photos, next_cursor) where
+        next_cursor is None once the last page has been read
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                MATCH_COLUMNS
+                + "WHERE m.run_id = ? AND pe.name = ? AND m.rowid > ? "
+                  "ORDER BY m.rowid LIMIT ?",
+                (run_id, person, after, limit + 1)
+            ).fetchall()
+        finally:
+            conn.close()
+
+        next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+        photos = []
+        for row in rows[:limit]:
+            match = _match_from_row(run_id, row)
+            photos.append({
+                'originalPath': match['originalPath'],
+                'newPath': match['newPath'],
+                'filename': match['filename'],
+                'similarity': match['similarity'],
+                'bbox': [match['x1'], match['y1'], match['x2'], match['y2']],
+                'timestamp': match['timestamp']
+            })
+        return photos, next_cursor
+
+    def iter_matches(self, run_id, batch_size=1000):
+        """Yield match rows for a run as dicts, reading in batches"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                MATCH_COLUMNS + "WHERE m.run_id = ? ORDER BY m.person_id, m.rowid",
+                (run_id,)
+            )
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _match_from_row(run_id, row)
+        finally:
+            conn.close()
+
+    def export_csv(self, run_id):
+        """Yield a run's matches as CSV text chunks"""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+        writer.writeheader()
+        for match in self.iter_matches(run_id):
+            writer.writerow(match)
+            if buffer.tell() >= 65536:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def export_jsonl(self, run_id):
+        """Yield a run's matches as JSON lines"""
+        for match in self.iter_matches(run_id):
+            yield json.dumps(match) + '\n'
@@ -0,0 +1,151 @@
+import csv
+import io
+import json
+import sqlite3
+
+import pytest
+
+from results_store import EXPORT_COLUMNS, ResultsStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "metadata" / "results.sqlite3")
+
+
+@pytest.fixture
+def store(db_path):
+    return ResultsStore(db_path, flush_every=2)
+
+
+def add_sample_matches(store, run_id):
+    store.add_match(run_id, "/in/a.jpg", "/out/bob/a.jpg", "bob", 0, 0, 0.7, [1, 2, 3, 4], 1.0)
+    store.add_match(run_id, "/in/b.jpg", "/out/bob/b.jpg", "bob", 0, 0, 0.8, [5, 6, 7, 8], 2.0)
+    store.add_match(run_id, "/in/a.jpg", "/out/kim/a.jpg", "kim", 1, 90, 0.6, None, 3.0)
+
+
+def test_paths_and_persons_are_interned(store, db_path):
+    run_id = store.start_run("/in", "/out", 0.5)
+    add_sample_matches(store, run_id)
+    store.finish_run(run_id, "complete", 2, 3)
+
+    conn = sqlite3.connect(db_path)
+    paths = [row[0] for row in conn.execute("SELECT path FROM paths")]
+    persons = [row[0] for row in conn.execute("SELECT name FROM persons")]
+    match_count = conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+    conn.close()
+
+    # /in/a.jpg is matched twice but stored once
+    assert sorted(paths) == ["/in/a.jpg", "/in/b.jpg", "/out/bob/a.jpg", "/out/bob/b.jpg", "/out/kim/a.jpg"]
+    assert sorted(persons) == ["bob", "kim"]
+    assert match_count == 3
+
+
+def test_matches_round_trip(store):
+    run_id = store.start_run("/in", "/out", 0.5)
+    add_sample_matches(store, run_id)
+    store.finish_run(run_id, "complete", 2, 3)
+
+    assert store.get_person_counts(run_id) == [
+        {"name": "bob", "photoCount": 2},
+        {"name": "kim", "photoCount": 1},
+    ]
+
+    photos, next_cursor = store.get_photos(run_id, "kim")
+    assert next_cursor is None
+    assert photos == [{
+        "originalPath": "/in/a.jpg",
+        "newPath": "/out/kim/a.jpg",
+        "filename": "a.jpg",
+        "similarity": 0.6,
+        "bbox": [None, None, None, None],
+        "timestamp": 3.0,
+    }]
+
+    run = store.get_run(run_id)
+    assert run["status"] == "complete"
+    assert run["totalScanned"] == 2
+    assert run["totalOrganized"] == 3
+    assert store.get_run(run_id + 1) is None
+
+
+def test_get_photos_pages_with_cursor(store):
+    run_id = store.start_run("/in", "/out", 0.5)
+    for i in range(5):
+        store.add_match(run_id, f"/in/{i}.jpg", f"/out/bob/{i}.jpg", "bob", 0, 0, 0.7, None, float(i))
+    store.flush()
+
+    first, cursor = store.get_photos(run_id, "bob", limit=2)
+    second, cursor = store.get_photos(run_id, "bob", limit=2, after=cursor)
+    third, cursor = store.get_photos(run_id, "bob", limit=2, after=cursor)
+
+    assert cursor is None
+    assert [p["filename"] for p in first + second + third] == [f"{i}.jpg" for i in range(5)]
+
+
+def test_runs_are_kept_separate(store):
+    first = store.start_run("/in", "/out", 0.5)
+    add_sample_matches(store, first)
+    store.finish_run(first, "complete", 2, 3)
+    second = store.start_run("/in2", "/out2", 0.6)
+    store.finish_run(second, "complete", 0, 0)
+
+    assert store.latest_run_id() == second
+    assert store.get_person_counts(second) == []
+    assert [run["id"] for run in store.list_runs()] == [second, first]
+
+
+def test_restart_marks_running_runs_interrupted(store, db_path):
+    finished = store.start_run("/in", "/out", 0.5)
+    store.finish_run(finished, "complete", 0, 0)
+    unfinished = store.start_run("/in", "/out", 0.5)
+
+    reopened = ResultsStore(db_path)
+
+    assert reopened.get_run(unfinished)["status"] == "interrupted"
+    assert reopened.get_run(finished)["status"] == "complete"
+    assert reopened.latest_run_id() == unfinished
+
+
+def test_export_csv(store):
+    run_id = store.start_run("/in", "/out", 0.5)
+    add_sample_matches(store, run_id)
+    store.finish_run(run_id, "complete", 2, 3)
+
+    rows = list(csv.DictReader(io.StringIO("".join(store.export_csv(run_id)))))
+
+    assert list(rows[0].keys()) == EXPORT_COLUMNS
+    assert [(row["person"], row["newPath"]) for row in rows] == [
+        ("bob", "/out/bob/a.jpg"),
+        ("bob", "/out/bob/b.jpg"),
+        ("kim", "/out/kim/a.jpg"),
+    ]
+    assert rows[0]["x2"] == "3.0"
+    assert rows[2]["x1"] == ""
+    assert rows[2]["rotation"] == "90"
+
+
+def test_export_jsonl(store):
+    run_id = store.start_run("/in", "/out", 0.5)
+    add_sample_matches(store, run_id)
+    store.finish_run(run_id, "complete", 2, 3)
+
+    lines = "".join(store.export_jsonl(run_id)).splitlines()
+    records = [json.loads(line) for line in lines]
+
+    assert len(records) == 3
+    assert records[1] == {
+        "runId": run_id,
+        "person": "bob",
+        "originalPath": "/in/b.jpg",
+        "newPath": "/out/bob/b.jpg",
+        "filename": "b.jpg",
+        "face": 0,
+        "rotation": 0,
+        "similarity": 0.8,
+        "x1": 5.0,
+        "y1": 6.0,
+        "x2": 7.0,
+        "y2": 8.0,
+        "timestamp": 2.0,
+    }
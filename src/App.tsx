@@ -5,7 +5,19 @@ import { PersonGallery } from './components/PersonGallery';
 import { Image, AlertCircle, CheckCircle2, X } from 'lucide-react';
 
 function App() {
-  const { status, progress, persons, error, start, cancel, reset } = useOrganizer();
+  const {
+    status,
+    progress,
+    persons,
+    runId,
+    photos,
+    hasMorePhotos,
+    error,
+    loadPhotos,
+    start,
+    cancel,
+    reset,
+  } = useOrganizer();
 
   const handleStart = async (
     inputFolder: string,
@@ -99,7 +111,14 @@ function App() {
 
         {/* Results Gallery */}
         {(status === 'running' || status === 'complete') && persons.length > 0 && (
-          <PersonGallery persons={persons} isComplete={status === 'complete'} />
+          <PersonGallery
+            persons={persons}
+            photos={photos}
+            hasMorePhotos={hasMorePhotos}
+            onLoadPhotos={loadPhotos}
+            runId={runId}
+            isComplete={status === 'complete'}
+          />
         )}
 
         {/* No Results Yet - Matte Card */}
@@ -1,16 +1,37 @@
 import { useState, useEffect } from 'react';
-import { Images, ChevronDown, ChevronsUp, ChevronsDown } from 'lucide-react';
-import type { Person } from '../types';
+import { Images, ChevronDown, ChevronsUp, ChevronsDown, Download } from 'lucide-react';
+import type { Person, Photo } from '../types';
+import { organizePhotos } from '../services/api';
 import { PhotoCard } from './PhotoCard';
 
 interface PersonGalleryProps {
   persons: Person[];
+  photos: Record<string, Photo[]>;
+  hasMorePhotos: Record<string, boolean>;
+  onLoadPhotos: (personName: string) => void;
+  runId?: number | null;
   isComplete?: boolean;
 }
 
-export const PersonGallery = ({ persons, isComplete = false }: PersonGalleryProps) => {
+export const PersonGallery = ({
+  persons,
+  photos,
+  hasMorePhotos,
+  onLoadPhotos,
+  runId = null,
+  isComplete = false,
+}: PersonGalleryProps) => {
   const [expandedPersons, setExpandedPersons] = useState<Set<string>>(new Set());
   
+  // Load the first page of photos for expanded persons
+  useEffect(() => {
+    expandedPersons.forEach(personName => {
+      if (!(personName in photos)) {
+        onLoadPhotos(personName);
+      }
+    });
+  }, [expandedPersons, photos, onLoadPhotos]);
+  
   // Auto-expand all persons when organization is complete
   useEffect(() => {
     if (isComplete && persons.length > 0) {
@@ -61,22 +82,35 @@ export const PersonGallery = ({ persons, isComplete = false }: PersonGalleryProp
             Organized Photos: <span className="text-cyan-400">{totalPhotos}</span> photo{totalPhotos !== 1 ? 's' : ''} • <span className="text-blue-500">{persons.length}</span> person{persons.length !== 1 ? 's' : ''}
           </h2>
         </div>
-        <button
-          onClick={toggleAll}
-          className="px-5 py-2 bg-blue-600 hover:bg-blue-500 text-white font-semibold rounded-full transition-all duration-300 hover:shadow-[0_0_20px_rgba(59,130,246,0.3)] text-sm flex items-center gap-2"
-        >
-          {allExpanded ? (
-            <>
-              <ChevronsUp className="w-4 h-4" />
-              Collapse All
-            </>
-          ) : (
-            <>
-              <ChevronsDown className="w-4 h-4" />
-              Expand All
-            </>
-          )}
-        </button>
+        <div className="flex items-center gap-2">
+          {isComplete && runId !== null && (['csv', 'jsonl'] as const).map((format) => (
+            <a
+              key={format}
+              href={organizePhotos.exportUrl(format, runId)}
+              download
+              className="px-4 py-2 bg-zinc-800 hover:bg-zinc-700 text-zinc-100 font-semibold rounded-full transition-all duration-300 text-sm flex items-center gap-2"
+            >
+              <Download className="w-4 h-4" />
+              {format.toUpperCase()}
+            </a>
+          ))}
+          <button
+            onClick={toggleAll}
+            className="px-5 py-2 bg-blue-600 hover:bg-blue-500 text-white font-semibold rounded-full transition-all duration-300 hover:shadow-[0_0_20px_rgba(59,130,246,0.3)] text-sm flex items-center gap-2"
+          >
+            {allExpanded ? (
+              <>
+                <ChevronsUp className="w-4 h-4" />
+                Collapse All
+              </>
+            ) : (
+              <>
+                <ChevronsDown className="w-4 h-4" />
+                Expand All
+              </>
+            )}
+          </button>
+        </div>
       </div>
 
       {/* Person Cards */}
@@ -116,10 +150,20 @@ export const PersonGallery = ({ persons, isComplete = false }: PersonGalleryProp
           {expandedPersons.has(person.name) && (
             <div className="p-6 pt-4 border-t border-white/5 bg-zinc-950">
               <div className="grid grid-cols-4 sm:grid-cols-5 md:grid-cols-6 lg:grid-cols-8 xl:grid-cols-10 2xl:grid-cols-12 gap-3">
-                {person.photos.map((photo, index) => (
+                {(photos[person.name] || []).map((photo, index) => (
                   <PhotoCard key={`${photo.filename}-${index}`} photo={photo} />
                 ))}
               </div>
+              {hasMorePhotos[person.name] && (
+                <div className="mt-4 flex justify-center">
+                  <button
+                    onClick={() => onLoadPhotos(person.name)}
+                    className="px-5 py-2 bg-zinc-800 hover:bg-zinc-700 text-zinc-100 font-semibold rounded-full transition-all duration-300 text-sm"
+                  >
+                    Load more
+                  </button>
+                </div>
+              )}
             </div>
           )}
         </div>
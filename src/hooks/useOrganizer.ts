@@ -1,6 +1,6 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useRef } from 'react';
 import { organizePhotos } from '../services/api';
-import type { OrganizeState, OrganizeRequest, Person } from '../types';
+import type { OrganizeState, OrganizeRequest, Person, Photo } from '../types';
 
 type OrganizerStatus = 'idle' | 'running' | 'complete' | 'error';
 
@@ -8,7 +8,11 @@ interface UseOrganizerReturn {
   status: OrganizerStatus;
   progress: OrganizeState['progress'];
   persons: Person[];
+  runId: number | null;
+  photos: Record<string, Photo[]>;
+  hasMorePhotos: Record<string, boolean>;
   error: string | null;
+  loadPhotos: (personName: string) => Promise<void>;
   start: (request: OrganizeRequest) => Promise<void>;
   cancel: () => Promise<void>;
   reset: () => void;
@@ -24,7 +28,44 @@ export const useOrganizer = (): UseOrganizerReturn => {
     currentPerson: '',
   });
   const [persons, setPersons] = useState<Person[]>([]);
+  const [runId, setRunId] = useState<number | null>(null);
+  // Photos are paged per person on demand; a null cursor means the last page was read
+  const [photos, setPhotos] = useState<Record<string, Photo[]>>({});
+  const [cursors, setCursors] = useState<Record<string, number | null>>({});
   const [error, setError] = useState<string | null>(null);
+  const loadingPhotos = useRef<Set<string>>(new Set());
+  const photosGeneration = useRef(0);
+
+  const clearPhotos = useCallback(() => {
+    photosGeneration.current += 1;
+    setPhotos({});
+    setCursors({});
+    loadingPhotos.current.clear();
+  }, []);
+
+  const loadPhotos = useCallback(async (personName: string) => {
+    if (runId === null || loadingPhotos.current.has(personName)) return;
+    if (personName in cursors && cursors[personName] === null) return;
+
+    const generation = photosGeneration.current;
+    loadingPhotos.current.add(personName);
+    try {
+      const page = await organizePhotos.getPhotos(personName, runId, cursors[personName] ?? undefined);
+      // Drop pages that arrive after the photo cache was cleared
+      if (generation !== photosGeneration.current) return;
+      setPhotos(prev => ({
+        ...prev,
+        [personName]: [...(prev[personName] || []), ...page.photos],
+      }));
+      setCursors(prev => ({ ...prev, [personName]: page.nextCursor }));
+    } catch (err) {
+      console.error(`Error loading photos for ${personName}:`, err);
+    } finally {
+      if (generation === photosGeneration.current) {
+        loadingPhotos.current.delete(personName);
+      }
+    }
+  }, [runId, cursors]);
 
   const start = useCallback(async (request: OrganizeRequest) => {
     try {
@@ -38,17 +79,20 @@ export const useOrganizer = (): UseOrganizerReturn => {
         currentPerson: '',
       });
       setPersons([]);
+      setRunId(null);
+      clearPhotos();
 
       const response = await organizePhotos.start(request);
       
       if (!response.success) {
         throw new Error(response.error || 'Failed to start organization');
       }
+      setRunId(response.runId ?? null);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Unknown error');
       setStatus('error');
     }
-  }, []);
+  }, [clearPhotos]);
 
   const cancel = useCallback(async () => {
     try {
@@ -69,8 +113,10 @@ export const useOrganizer = (): UseOrganizerReturn => {
       currentPerson: '',
     });
     setPersons([]);
+    setRunId(null);
+    clearPhotos();
     setError(null);
-  }, []);
+  }, [clearPhotos]);
 
   // Poll for progress when running
   useEffect(() => {
@@ -82,6 +128,9 @@ export const useOrganizer = (): UseOrganizerReturn => {
         
         setProgress(data.progress);
         setPersons(data.persons);
+        if (data.runId !== undefined) {
+          setRunId(data.runId);
+        }
 
         // Check for errors from backend
         if (data.error) {
@@ -120,6 +169,8 @@ export const useOrganizer = (): UseOrganizerReturn => {
             setPersons(results.persons || []);
           }
           
+          // Pages fetched mid-run may be incomplete; reload them from the finished run
+          clearPhotos();
           setStatus('complete');
         }
       } catch (err) {
@@ -131,13 +182,22 @@ export const useOrganizer = (): UseOrganizerReturn => {
     }, 500);
 
     return () => clearInterval(interval);
-  }, [status]);
+  }, [status, clearPhotos]);
+
+  const hasMorePhotos: Record<string, boolean> = {};
+  for (const personName of Object.keys(photos)) {
+    hasMorePhotos[personName] = cursors[personName] !== null;
+  }
 
   return {
     status,
     progress,
     persons,
+    runId,
+    photos,
+    hasMorePhotos,
     error,
+    loadPhotos,
     start,
     cancel,
     reset,
@@ -4,6 +4,7 @@ import type {
   OrganizeResponse,
   OrganizeState,
   ResultsResponse,
+  PhotosPage,
   HealthResponse,
   EmbeddingsResponse
 } from '../types';
@@ -24,11 +25,24 @@ export const organizePhotos = {
     return response.data;
   },
 
-  getResults: async (): Promise<ResultsResponse> => {
-    const response = await api.get('/organize/results');
+  getResults: async (runId?: number): Promise<ResultsResponse> => {
+    const response = await api.get('/organize/results', { params: { runId } });
     return response.data;
   },
 
+  getPhotos: async (person: string, runId?: number, after?: number): Promise<PhotosPage> => {
+    const response = await api.get('/organize/results/photos', {
+      params: { person, runId, after },
+    });
+    return response.data;
+  },
+
+  exportUrl: (format: 'csv' | 'jsonl', runId?: number): string => {
+    const params = new URLSearchParams({ format });
+    if (runId !== undefined) params.set('runId', String(runId));
+    return `${api.defaults.baseURL}/organize/results/export?${params}`;
+  },
+
   cancel: async (): Promise<OrganizeResponse> => {
     const response = await api.post('/organize/cancel');
     return response.data;
@@ -3,13 +3,20 @@ export interface Photo {
   newPath: string;
   filename: string;
   similarity: number;
+  bbox?: [number, number, number, number];
   timestamp: number;
 }
 
 export interface Person {
   name: string;
   photoCount: number;
+}
+
+export interface PhotosPage {
+  runId: number;
+  person: string;
   photos: Photo[];
+  nextCursor: number | null;
 }
 
 export interface Progress {
@@ -23,6 +30,7 @@ export interface Progress {
 export interface OrganizeState {
   active: boolean;
   initializing?: boolean;
+  runId?: number | null;
   progress: Progress;
   persons: Person[];
   error?: string;
@@ -39,6 +47,7 @@ export interface OrganizeRequest {
 export interface OrganizeResponse {
   success: boolean;
   message?: string;
+  runId?: number;
   error?: string;
 }
 
@@ -54,6 +63,7 @@ export interface EmbeddingsResponse {
 }
 
 export interface ResultsResponse {
+  runId: number | null;
   persons: Person[];
   totalScanned: number;
   totalOrganized: number;